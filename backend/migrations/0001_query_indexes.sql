@@ -0,0 +1,29 @@
+-- Migration 0001: Indexes and constraints for the per-job queries
+-- Applied once by the backend on startup (see services/migrations.py).
+-- On large existing tables, run the CREATE INDEX statements by hand with
+-- CONCURRENTLY first to avoid blocking writes; IF NOT EXISTS makes this a no-op afterwards.
+
+-- GET /logs/{job_id}: WHERE job_id = ? ORDER BY row_number, id
+CREATE INDEX IF NOT EXISTS idx_logs_job_row ON logs (job_id, row_number, id);
+
+-- GET /clean-data?job_id=: WHERE job_id = ? ORDER BY id
+CREATE INDEX IF NOT EXISTS idx_clean_data_job_id ON clean_data (job_id, id);
+
+-- GET /jobs/{job_id}/export and full revalidation: WHERE job_id = ? ORDER BY row_number NULLS LAST, id
+CREATE INDEX IF NOT EXISTS idx_clean_data_job_row ON clean_data (job_id, row_number, id);
+CREATE INDEX IF NOT EXISTS idx_quarantine_data_job_row ON quarantine_data (job_id, row_number, id);
+
+-- GET /quarantine: keyset pagination on (created_at, id), optionally per job
+CREATE INDEX IF NOT EXISTS idx_quarantine_data_created_id ON quarantine_data (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_quarantine_data_job_created_id ON quarantine_data (job_id, created_at DESC, id DESC);
+
+-- GET /jobs: ORDER BY created_at DESC LIMIT 100
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs (created_at DESC);
+
+-- Every row belongs to a job. NOT VALID skips checking rows written before
+-- this migration (older databases may hold orphans); new rows are enforced.
+ALTER TABLE clean_data ADD CONSTRAINT fk_clean_data_job FOREIGN KEY (job_id) REFERENCES jobs (id) NOT VALID;
+ALTER TABLE quarantine_data ADD CONSTRAINT fk_quarantine_data_job FOREIGN KEY (job_id) REFERENCES jobs (id) NOT VALID;
+ALTER TABLE logs ADD CONSTRAINT fk_logs_job FOREIGN KEY (job_id) REFERENCES jobs (id) NOT VALID;
+
+ALTER TABLE logs ADD CONSTRAINT chk_logs_status_color CHECK (status_color IN ('green', 'red')) NOT VALID;
@@ -0,0 +1,14 @@
+-- Migration 0002: Compact storage for passing rows (LOG_GRANULARITY=summary)
+-- Each row is an inclusive run of row numbers of one job that passed every rule.
+-- GET /logs/{job_id} expands them back into one green entry per row.
+
+CREATE TABLE IF NOT EXISTS log_green_ranges (
+    id SERIAL PRIMARY KEY,
+    job_id INT NOT NULL REFERENCES jobs (id),
+    first_row INT NOT NULL,
+    last_row INT NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW(),
+    CHECK (first_row <= last_row)
+);
+
+CREATE INDEX IF NOT EXISTS idx_log_green_ranges_job_row ON log_green_ranges (job_id, first_row);
@@ -0,0 +1,29 @@
+-- Migration 0003: Chunked, resumable uploads
+-- A session is created by POST /uploads; each PUT of a numbered chunk adds a
+-- row to upload_chunks once the chunk is on disk, so clients can ask which
+-- chunks arrived and resend only the rest.
+
+CREATE TABLE IF NOT EXISTS upload_sessions (
+    id TEXT PRIMARY KEY,
+    job_id INT NOT NULL REFERENCES jobs (id),
+    filename TEXT NOT NULL,
+    column_rules TEXT,
+    status TEXT NOT NULL DEFAULT 'receiving',
+    total_chunks INT,
+    ingest_started BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW(),
+    CHECK (status IN ('receiving', 'complete', 'aborted'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_upload_sessions_job ON upload_sessions (job_id);
+
+CREATE TABLE IF NOT EXISTS upload_chunks (
+    upload_id TEXT NOT NULL REFERENCES upload_sessions (id) ON DELETE CASCADE,
+    chunk_index INT NOT NULL,
+    size BIGINT NOT NULL,
+    sha256 TEXT NOT NULL,
+    received_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (upload_id, chunk_index),
+    CHECK (chunk_index >= 0)
+);
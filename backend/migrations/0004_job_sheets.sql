@@ -0,0 +1,11 @@
+-- Migration 0004: Multi-sheet Excel uploads
+-- Uploading a workbook with `sheets` creates one parent job for the file and
+-- one sub-job per selected sheet; the parent's row counts are the sum of its
+-- sheets'. A chunked upload keeps the selection until ingestion starts.
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS parent_job_id INT REFERENCES jobs (id);
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS sheet_name TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_parent ON jobs (parent_job_id) WHERE parent_job_id IS NOT NULL;
+
+ALTER TABLE upload_sessions ADD COLUMN IF NOT EXISTS sheets TEXT;
@@ -0,0 +1,19 @@
+-- Migration 0005: Job owners
+-- Queued work lives only in the server process that queued it. Each process
+-- registers in ingest_owners and refreshes heartbeat_at while it runs; a job
+-- records its owning process and the spooled file or chunk directory it
+-- reads, so the interrupted-job sweep fails only jobs whose owner stopped
+-- heartbeating and removes only their files.
+
+CREATE TABLE IF NOT EXISTS ingest_owners (
+    id TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    pid INT NOT NULL,
+    started_at TIMESTAMP DEFAULT NOW(),
+    heartbeat_at TIMESTAMP DEFAULT NOW()
+);
+
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS owner_id TEXT;
+ALTER TABLE jobs ADD COLUMN IF NOT EXISTS spool_path TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_jobs_unfinished ON jobs (owner_id) WHERE status IN ('queued', 'processing');
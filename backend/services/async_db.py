@@ -0,0 +1,63 @@
+from sqlalchemy.engine import make_url
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import asyncpg  # noqa: F401  (driver for the asyncio engine)
+    from sqlalchemy.ext.asyncio import create_async_engine
+except ImportError:  # async reads are optional
+    create_async_engine = None
+
+
+def make_async_engine(database_url, **pool_options):
+    """
+    Create an asyncpg-backed engine for the same database as database_url.
+
+    Returns:
+        AsyncEngine, or None when asyncpg is not installed
+    """
+    if create_async_engine is None:
+        return None
+    url = make_url(database_url).set(drivername="postgresql+asyncpg")
+    return create_async_engine(url, **pool_options)
+
+
+class ReadExecutor:
+    """
+    Runs read-only queries for async handlers.
+
+    Queries go through the asyncpg engine when there is one, so waiting on
+    PostgreSQL does not hold a thread. Without it they run on the sync
+    engine in Starlette's threadpool, as a plain `def` handler would.
+
+    Args:
+        engine: Synchronous engine
+        async_engine: Optional AsyncEngine for the same database
+    """
+
+    def __init__(self, engine, async_engine=None):
+        self.engine = engine
+        self.async_engine = async_engine
+
+    @property
+    def mode(self):
+        return "async" if self.async_engine is not None else "threadpool"
+
+    async def fetch_all(self, statement, params=None):
+        """Execute statement and return all rows."""
+        if self.async_engine is not None:
+            async with self.async_engine.connect() as conn:
+                result = await conn.execute(statement, params or {})
+                return result.fetchall()
+        return await run_in_threadpool(self._fetch_all_sync, statement, params)
+
+    async def fetch_one(self, statement, params=None):
+        rows = await self.fetch_all(statement, params)
+        return rows[0] if rows else None
+
+    def _fetch_all_sync(self, statement, params):
+        with self.engine.connect() as conn:
+            return conn.execute(statement, params or {}).fetchall()
+
+    async def dispose(self):
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
@@ -0,0 +1,143 @@
+import hashlib
+import os
+import shutil
+import time
+import uuid
+
+# Chunk files are named by index so a directory listing sorts in upload order
+CHUNK_SUFFIX = ".chunk"
+
+
+class UploadAborted(Exception):
+    """The upload session was cancelled while its rows were being read."""
+
+
+def chunk_path(directory, index):
+    return os.path.join(directory, f"{index:08d}{CHUNK_SUFFIX}")
+
+
+class ChunkReceiver:
+    """
+    Writes one uploaded chunk to a temporary file, hashing it as it arrives.
+
+    The chunk only appears under its final name on commit(), so readers
+    never see a partial chunk, and an interrupted PUT leaves nothing behind
+    after discard().
+
+    Args:
+        directory: The upload's spool directory
+        index: Chunk number (0-based)
+        max_size: Largest accepted chunk in bytes
+    """
+
+    def __init__(self, directory, index, max_size):
+        self.directory = directory
+        self.index = index
+        self.max_size = max_size
+        self.size = 0
+        self._hash = hashlib.sha256()
+        self._temp_path = os.path.join(directory, f"{index:08d}.{uuid.uuid4().hex}.part")
+        self._file = open(self._temp_path, "wb")
+
+    @property
+    def sha256(self):
+        return self._hash.hexdigest()
+
+    def write(self, data):
+        self.size += len(data)
+        if self.size > self.max_size:
+            raise ValueError(f"Chunk exceeds {self.max_size} bytes")
+        self._hash.update(data)
+        self._file.write(data)
+
+    def commit(self):
+        """Flush to disk and move the chunk under its final name. Returns its path."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        path = chunk_path(self.directory, self.index)
+        os.replace(self._temp_path, path)
+        return path
+
+    def discard(self):
+        self._file.close()
+        try:
+            os.remove(self._temp_path)
+        except OSError:
+            pass
+
+
+class ChunkedSpoolReader:
+    """
+    Binary file object over the chunks of an upload, read in index order.
+
+    When the next chunk has not arrived yet, read() waits for it, so
+    ingestion can run while the client is still sending later chunks.
+    Reads end once the session is complete and every chunk has been read.
+
+    Args:
+        directory: The upload's spool directory
+        session_state: Callable returning (status, total_chunks) for the session
+        poll_seconds: Wait between checks for a missing chunk
+        idle_timeout: Seconds without a new chunk before giving up
+    """
+
+    def __init__(self, directory, session_state, poll_seconds=0.5, idle_timeout=3600):
+        self.directory = directory
+        self.session_state = session_state
+        self.poll_seconds = poll_seconds
+        self.idle_timeout = idle_timeout
+        self._index = 0
+        self._current = None
+
+    def read(self, size=-1):
+        while True:
+            if self._current is None and not self._open_next():
+                return b""
+            data = self._current.read(size)
+            if data or size == 0:
+                return data
+            # This chunk is exhausted; continue with the next one
+            self._current.close()
+            self._current = None
+            self._index += 1
+
+    def _open_next(self):
+        """Open chunk self._index, waiting for it to arrive. Returns False at end of upload."""
+        waited_since = time.monotonic()
+        while True:
+            try:
+                self._current = open(chunk_path(self.directory, self._index), "rb")
+                return True
+            except FileNotFoundError:
+                pass
+
+            status, total_chunks = self.session_state()
+            if status == "aborted":
+                raise UploadAborted("Upload was aborted")
+            if status == "complete" and total_chunks is not None and self._index >= total_chunks:
+                return False
+            if status == "complete":
+                raise ValueError(f"Chunk {self._index} is missing from a completed upload")
+            if time.monotonic() - waited_since > self.idle_timeout:
+                raise TimeoutError(f"No chunk {self._index} received in {self.idle_timeout} seconds")
+            time.sleep(self.poll_seconds)
+
+    def close(self):
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def assemble_chunks(directory, total_chunks, destination, copy_chunk_size=1024 * 1024):
+    """Concatenate chunks 0..total_chunks-1 into one file (for formats that need random access)."""
+    with open(destination, "wb") as assembled:
+        for index in range(total_chunks):
+            with open(chunk_path(directory, index), "rb") as chunk:
+                shutil.copyfileobj(chunk, assembled, copy_chunk_size)
@@ -0,0 +1,120 @@
+import csv
+import io
+import json
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+# Format name -> (media type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def parquet_available():
+    return pa is not None
+
+
+def _cell(value):
+    """Export cells as text, the type every uploaded value arrives in."""
+    return None if value is None else str(value)
+
+
+def iter_csv(columns, batches):
+    """
+    Yield a CSV document one batch at a time.
+
+    Args:
+        columns: Header, in output order
+        batches: Iterable of lists of row dicts
+
+    Yields:
+        str chunks: the header, then one chunk per batch
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows([row.get(c, "") for c in columns] for row in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # The header alone when there are no rows
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_ndjson(columns, batches):
+    """Yield one JSON object per row, keys in column order, one chunk per batch."""
+    for batch in batches:
+        yield "".join(
+            json.dumps({c: row.get(c) for c in columns}) + "\n"
+            for row in batch
+        )
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file object that hands written bytes back in chunks.
+
+    The Parquet writer records byte offsets via tell(), so position keeps
+    counting across drains even though the bytes are released.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_parquet(columns, batches):
+    """
+    Yield a Parquet file with one row group per batch. All columns are strings.
+
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    if pa is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+
+    schema = pa.schema([(c, pa.string()) for c in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for batch in batches:
+            writer.write_table(pa.Table.from_pydict(
+                {c: [_cell(row.get(c)) for row in batch] for c in columns},
+                schema=schema
+            ))
+            yield sink.drain()
+    finally:
+        writer.close()
+    # Footer
+    yield sink.drain()
+
+
+def iter_export(export_format, columns, batches):
+    """Dispatch to the writer for export_format (a key of EXPORT_FORMATS)."""
+    writers = {"csv": iter_csv, "ndjson": iter_ndjson, "parquet": iter_parquet}
+    return writers[export_format](columns, batches)
@@ -0,0 +1,474 @@
+import codecs
+import csv
+import gzip
+import itertools
+import mmap
+import os
+import random
+import re
+import zipfile
+from contextlib import contextmanager
+
+import openpyxl
+
+try:
+    import zstandard
+except ImportError:  # .csv.zst uploads are optional
+    zstandard = None
+
+# Bytes read from an upload per call; only one chunk is decoded at a time
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Smaller reads for previews, which only need the first few rows
+PREVIEW_CHUNK_SIZE = 64 * 1024
+
+# A quote with a non-delimiter on both sides: a literal quote inside an
+# unquoted field, which throws off quote counting for range splitting
+_STRAY_QUOTE = re.compile(rb'[^,\n"]"[^,\r\n"]')
+
+# Compressed CSV uploads: filename suffix -> compression
+COMPRESSED_CSV_SUFFIXES = {".csv.gz": "gzip", ".csv.zst": "zstd", ".zip": "zip"}
+
+
+def csv_compression(filename):
+    """Compression of a CSV upload ("gzip", "zstd" or "zip") from its name, or None."""
+    filename_lower = filename.lower()
+    for suffix, compression in COMPRESSED_CSV_SUFFIXES.items():
+        if filename_lower.endswith(suffix):
+            return compression
+    return None
+
+
+def zstd_available():
+    return zstandard is not None
+
+
+def open_compressed_csv(fileobj, compression):
+    """
+    Wrap a compressed upload in a binary file object that yields the CSV
+    bytes, decompressed as they are read.
+
+    gzip and zstd streams are read front to back, so fileobj need not be
+    seekable. A ZIP's index sits at the end of the archive, so fileobj
+    must be seekable; the archive must hold exactly one .csv file.
+
+    Raises:
+        ValueError: If the archive or compression is not usable
+    """
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=fileobj, mode="rb")
+
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("Zstandard uploads need the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(fileobj, read_across_frames=True, closefd=False)
+
+    if compression == "zip":
+        try:
+            archive = zipfile.ZipFile(fileobj)
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"Invalid ZIP file: {e}")
+        members = [
+            member for member in archive.infolist()
+            if not member.is_dir()
+            and member.filename.lower().endswith(".csv")
+            and not member.filename.startswith("__MACOSX/")
+        ]
+        if len(members) != 1:
+            raise ValueError(f"ZIP file must contain exactly one .csv file, found {len(members)}")
+        return archive.open(members[0])
+
+    raise ValueError(f"Unknown compression '{compression}'")
+
+
+def iter_text_lines(fileobj, chunk_size=DEFAULT_CHUNK_SIZE, encoding="utf-8"):
+    """
+    Read a binary file object in chunks and yield decoded text lines.
+
+    Args:
+        fileobj: Binary file-like object supporting read(n)
+        chunk_size: Number of bytes to read per call
+        encoding: Text encoding of the payload
+
+    Yields:
+        Lines including their trailing newline (the last line may lack one)
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+
+    while True:
+        chunk = fileobj.read(chunk_size)
+        final = not chunk
+        pending += decoder.decode(chunk, final=final)
+
+        # Everything before the last newline is complete; keep the tail for the next chunk
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+
+        if final:
+            break
+
+    if pending:
+        yield pending
+
+
+def open_csv_rows(fileobj, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Open a CSV upload as a streaming DictReader.
+
+    Rows are parsed lazily as the caller iterates, so memory stays bounded
+    by the chunk size rather than the file size. fieldnames is None when
+    the file is empty.
+    """
+    return csv.DictReader(iter_text_lines(fileobj, chunk_size))
+
+
+@contextmanager
+def map_file(fileobj):
+    """
+    Memory-map the file behind fileobj, read-only, for the duration of the block.
+
+    Yields the mmap, b"" for an empty file (which cannot be mapped), or
+    None when fileobj has no file descriptor (e.g. a chunked upload that
+    is still being received).
+    """
+    fileno = getattr(fileobj, "fileno", None)
+    if fileno is None:
+        yield None
+        return
+    fd = fileno()
+    if os.fstat(fd).st_size == 0:
+        yield b""
+        return
+    mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    try:
+        yield mapped
+    finally:
+        mapped.close()
+
+
+def iter_buffer_lines(buffer, start=0, end=None, chunk_size=DEFAULT_CHUNK_SIZE, encoding="utf-8"):
+    """
+    Yield decoded text lines of buffer[start:end] (an mmap or bytes).
+
+    Text is decoded a block of whole lines at a time, straight from the
+    buffer through a memoryview, so the file is never copied into a
+    bytes object. Blocks end on a newline, which never falls inside a
+    multi-byte UTF-8 character.
+    """
+    end = len(buffer) if end is None else end
+    position = start
+    while position < end:
+        newline = buffer.rfind(b"\n", position, min(position + chunk_size, end))
+        if newline < 0:
+            # A line longer than chunk_size: decode through to its end
+            newline = buffer.find(b"\n", position, end)
+        stop = end if newline < 0 else newline + 1
+
+        # The view is released before yielding, so the mmap can be closed at any time
+        with memoryview(buffer) as view:
+            block = str(view[position:stop], encoding)
+        position = stop
+
+        lines = block.split("\n")
+        tail = lines.pop()
+        for line in lines:
+            yield line + "\n"
+        if tail:
+            yield tail
+
+
+def open_buffer_rows(buffer, start=0, end=None, fieldnames=None):
+    """
+    DictReader over CSV records in buffer[start:end].
+
+    Without fieldnames the first record is the header, as in open_csv_rows;
+    a worker reading one range of a file passes the header it was given.
+    """
+    return csv.DictReader(iter_buffer_lines(buffer, start, end), fieldnames=fieldnames)
+
+
+def _count_quotes(buffer, start, end, window=DEFAULT_CHUNK_SIZE):
+    # mmap has no count(); count a bounded window at a time
+    total = 0
+    for position in range(start, end, window):
+        total += buffer[position:min(position + window, end)].count(b'"')
+    return total
+
+
+def _record_end(buffer, record_start, position, end):
+    """
+    Offset just past the first newline at or after `position` that ends a
+    record, i.e. with an even number of quotes since `record_start`; or end.
+    """
+    quotes = 0
+    scanned = record_start
+    while True:
+        newline = buffer.find(b"\n", position, end)
+        if newline < 0:
+            return end
+        quotes += _count_quotes(buffer, scanned, newline)
+        scanned = newline
+        if quotes % 2 == 0:
+            return newline + 1
+        position = newline + 1
+
+
+def csv_data_start(buffer):
+    """Offset of the first record after the CSV header."""
+    return _record_end(buffer, 0, 0, len(buffer))
+
+
+def split_line_ranges(buffer, parts, start=0, end=None):
+    """
+    Cut buffer[start:end] into up to `parts` byte ranges of similar size,
+    each starting at a record boundary, for workers that parse in parallel.
+
+    A boundary is a newline outside quotes, so quoted fields spanning
+    lines stay whole. Quotes are counted rather than parsed, which is exact
+    for quoting as CSV writers produce it (whole fields, embedded quotes
+    doubled). A file with an odd quote count or a quote inside an unquoted
+    field is returned as one range.
+
+    Args:
+        buffer: mmap or bytes holding the file
+        parts: Number of ranges wanted
+        start: Offset of the first record (e.g. csv_data_start)
+        end: End offset (default: end of buffer)
+
+    Returns:
+        List of (start, end) offsets covering buffer[start:end] in order
+    """
+    end = len(buffer) if end is None else end
+    if parts <= 1 or end - start < 2 * parts:
+        return [(start, end)]
+    if _count_quotes(buffer, start, end) % 2 or _STRAY_QUOTE.search(buffer, start, end):
+        return [(start, end)]
+
+    ranges = []
+    range_start = start
+    step = (end - start) / parts
+    for part in range(1, parts):
+        target = max(start + int(part * step), range_start)
+        boundary = _record_end(buffer, range_start, target, end)
+        if boundary >= end:
+            break
+        ranges.append((range_start, boundary))
+        range_start = boundary
+    ranges.append((range_start, end))
+    return ranges
+
+
+def sample_csv_rows(fileobj, columns, count, window=PREVIEW_CHUNK_SIZE, seed=None):
+    """
+    Pick up to `count` rows spread across a seekable CSV file.
+
+    The file is cut into `count` equal segments; from a random offset in
+    each, the next complete line is parsed. At most count * window bytes
+    are read regardless of file size. Lines whose field count does not
+    match the header (e.g. the offset fell inside a quoted multi-line
+    field) are skipped.
+
+    Args:
+        fileobj: Seekable binary file object
+        columns: Header fields, used to build row dicts
+        count: Number of rows to sample
+        window: Bytes read at each offset
+        seed: Optional seed for reproducible samples
+
+    Returns:
+        List of row dicts (may be shorter than count)
+    """
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
+    if size == 0 or count <= 0:
+        return []
+
+    rng = random.Random(seed)
+    segment = size / count
+    rows = []
+    for i in range(count):
+        fileobj.seek(int(i * segment + rng.random() * segment))
+        window_bytes = fileobj.read(window)
+
+        # Skip the partial line the offset landed in
+        start = window_bytes.find(b"\n")
+        end = window_bytes.find(b"\n", start + 1) if start >= 0 else -1
+        if end < 0:
+            continue
+
+        line = window_bytes[start + 1:end].decode("utf-8", errors="replace").rstrip("\r")
+        fields = next(csv.reader([line]), None)
+        if fields is None or len(fields) != len(columns):
+            continue
+        rows.append(dict(zip(columns, fields)))
+
+    return rows
+
+
+def iter_batches(rows, batch_size):
+    """
+    Group an iterable of rows into lists of at most batch_size rows.
+    """
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class SheetRows:
+    """
+    Data rows of a fully loaded sheet, kept as lists of cell values.
+
+    Batches can be validated column by column (column_values) without a
+    dict per row; iterating yields row dicts like the streaming readers,
+    and row_dicts builds them lazily for one batch when it is persisted.
+
+    Args:
+        columns: Header fields
+        rows: One list of cell values per data row, in header order
+    """
+
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+        # With duplicate headers the last column wins, as in dict(zip(columns, values))
+        self._index = {name: position for position, name in enumerate(columns)}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return self.row_dicts(self.rows)
+
+    def batches(self, batch_size):
+        """Yield slices of at most batch_size rows (lists of cell values)."""
+        for start in range(0, len(self.rows), batch_size):
+            yield self.rows[start:start + batch_size]
+
+    def column_values(self, batch, names):
+        """
+        Transpose a batch into {column_name: list of values} for the columns
+        in names that the sheet has (the input vector_engine.validate_columns takes).
+        """
+        transposed = list(zip(*batch))
+        return {
+            name: list(transposed[self._index[name]]) if transposed else []
+            for name in names if name in self._index
+        }
+
+    def row_dicts(self, batch):
+        """Lazily build the row dict of each row in a batch."""
+        columns = self.columns
+        return (dict(zip(columns, values)) for values in batch)
+
+
+def _next_data_row(rows):
+    """Return the first row that has at least one non-empty cell, or None."""
+    for row in rows:
+        if not all(cell is None for cell in row):
+            return row
+    return None
+
+
+def _xlsx_row_dicts(rows, columns, first_row):
+    if first_row is None:
+        return
+    yield dict(zip(columns, first_row))
+    for row in rows:
+        if all(cell is None for cell in row):
+            continue
+        yield dict(zip(columns, row))
+
+
+class XlsxRows:
+    """
+    Row dicts of one sheet of a read-only workbook, which this object owns.
+
+    Read-only workbooks keep the archive open until closed. close() releases
+    it whether or not iteration has started; exhausting the rows also does.
+
+    Args:
+        workbook: Workbook opened with read_only=True
+        rows: The sheet's values_only row iterator, past the header
+        columns: Header fields
+        first_row: First data row already read from rows, or None
+    """
+
+    def __init__(self, workbook, rows, columns, first_row):
+        self._workbook = workbook
+        self._dicts = _xlsx_row_dicts(rows, columns, first_row)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._dicts)
+        except StopIteration:
+            self.close()
+            raise
+
+    def close(self):
+        self._dicts.close()
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def xlsx_sheet_names(fileobj):
+    """Names of the worksheets (not chart sheets) in an XLSX upload, in workbook order."""
+    workbook = openpyxl.load_workbook(fileobj, read_only=True)
+    try:
+        return [worksheet.title for worksheet in workbook.worksheets]
+    finally:
+        workbook.close()
+
+
+class EmptySheetError(ValueError):
+    """A spreadsheet (or one sheet of it) with no header row or no data rows."""
+
+
+def open_xlsx_rows(fileobj, sheet_name=None, require_rows=True):
+    """
+    Open one sheet of an XLSX upload (default: the active sheet) in
+    read-only streaming mode.
+
+    Rows are read from the archive as the caller iterates instead of
+    building the full cell graph. Close rows_iter (or exhaust it) to
+    release the workbook, even if it was never iterated.
+
+    Returns:
+        (columns, rows_iter) where rows_iter is an XlsxRows yielding one
+        dict per non-empty row
+
+    Raises:
+        EmptySheetError: If the sheet has no headers, or no data rows and
+            require_rows is set (a preview of a header-only sheet is fine)
+    """
+    workbook = openpyxl.load_workbook(fileobj, read_only=True)
+    try:
+        sheet = workbook.active if sheet_name is None else workbook[sheet_name]
+        rows = sheet.iter_rows(values_only=True)
+        columns = list(next(rows, None) or [])
+        if not columns or columns == [None]:
+            raise EmptySheetError("Excel file is empty or has no headers")
+
+        first_row = _next_data_row(rows)
+        if first_row is None and require_rows:
+            raise EmptySheetError("Excel file has no data rows")
+    except Exception:
+        workbook.close()
+        raise
+
+    return columns, XlsxRows(workbook, rows, columns, first_row)
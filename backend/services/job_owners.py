@@ -0,0 +1,98 @@
+import os
+import socket
+import threading
+import uuid
+
+from sqlalchemy import text
+
+# Arbitrary key for pg_try_advisory_xact_lock, so only one process sweeps at a time
+SWEEP_LOCK_ID = 7246002
+
+
+class JobOwner:
+    """
+    This process's entry in ingest_owners.
+
+    Jobs queued here carry its id in jobs.owner_id. A heartbeat thread keeps
+    heartbeat_at current; an owner whose heartbeat is older than `timeout`
+    seconds is treated as dead, and any process may sweep its jobs.
+    """
+
+    def __init__(self, engine, heartbeat_seconds, timeout):
+        self.engine = engine
+        self.heartbeat_seconds = heartbeat_seconds
+        self.timeout = timeout
+        self.host = socket.gethostname()
+        self.pid = os.getpid()
+        self.id = f"{self.host}:{self.pid}:{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+        self._thread = None
+
+    def register(self):
+        with self.engine.begin() as conn:
+            conn.execute(text("""
+                INSERT INTO ingest_owners (id, host, pid) VALUES (:id, :host, :pid)
+                ON CONFLICT (id) DO UPDATE SET heartbeat_at = NOW()
+            """), {"id": self.id, "host": self.host, "pid": self.pid})
+
+    def unregister(self):
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM ingest_owners WHERE id = :id"), {"id": self.id})
+
+    def heartbeat(self):
+        with self.engine.begin() as conn:
+            beat = conn.execute(text("""
+                UPDATE ingest_owners SET heartbeat_at = NOW() WHERE id = :id RETURNING id
+            """), {"id": self.id}).fetchone()
+        if beat is None:
+            # Removed by another process's sweep after a long stall
+            self.register()
+
+    def start(self, on_beat=None):
+        """Heartbeat every heartbeat_seconds, calling on_beat() after each beat."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(on_beat,), name="job-owner-heartbeat", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.heartbeat_seconds + 1)
+            self._thread = None
+
+    def _run(self, on_beat):
+        while not self._stop.wait(self.heartbeat_seconds):
+            try:
+                self.heartbeat()
+                if on_beat is not None:
+                    on_beat()
+            except Exception as e:
+                print(f"Note: job owner heartbeat: {str(e)}")
+
+    def claim_orphaned_jobs(self, conn, error_message):
+        """
+        Fail queued or processing jobs whose owner is dead, and forget dead owners.
+
+        Runs under a transaction-scoped advisory lock; when another process is
+        already sweeping, returns [] without waiting. Jobs with no owner were
+        queued before owners were recorded and count as orphaned.
+
+        Returns:
+            List of (job_id, spool_path) for the jobs marked failed
+        """
+        if not conn.execute(text("SELECT pg_try_advisory_xact_lock(:lock_id)"), {"lock_id": SWEEP_LOCK_ID}).scalar():
+            return []
+        live = """
+            SELECT id FROM ingest_owners
+            WHERE id = :owner_id OR heartbeat_at > NOW() - make_interval(secs => :timeout)
+        """
+        swept = conn.execute(text(f"""
+            UPDATE jobs SET status = 'failed', error_message = :error_message
+            WHERE status IN ('queued', 'processing')
+              AND (owner_id IS NULL OR owner_id NOT IN ({live}))
+            RETURNING id, spool_path
+        """), {"owner_id": self.id, "timeout": self.timeout, "error_message": error_message}).fetchall()
+        conn.execute(text(f"DELETE FROM ingest_owners WHERE id NOT IN ({live})"), {"owner_id": self.id, "timeout": self.timeout})
+        return [tuple(row) for row in swept]
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from sqlalchemy import text
+
+# Numbered SQL files (0001_name.sql, 0002_name.sql, ...) applied in order
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+# Arbitrary key for pg_advisory_xact_lock, so concurrent app processes do not
+# apply the same migration twice
+MIGRATION_LOCK_ID = 7246001
+
+
+def migration_files(directory=MIGRATIONS_DIR):
+    """Return (version, path) for every migration file, oldest first."""
+    return [(path.stem, path) for path in sorted(Path(directory).glob("*.sql"))]
+
+
+def apply_migrations(conn, directory=MIGRATIONS_DIR):
+    """
+    Apply migrations that have not yet run, each in its own transaction.
+
+    Applied versions are recorded in schema_migrations. A failing migration
+    is rolled back and stops the run, leaving later ones pending.
+
+    Args:
+        conn: SQLAlchemy connection with no transaction in progress
+
+    Returns:
+        List of versions applied by this call
+    """
+    with conn.begin():
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version TEXT PRIMARY KEY,
+                applied_at TIMESTAMP DEFAULT NOW()
+            )
+        """))
+
+    applied = []
+    for version, path in migration_files(directory):
+        with conn.begin():
+            conn.execute(text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID})
+            done = conn.execute(text("""
+                SELECT 1 FROM schema_migrations WHERE version = :version
+            """), {"version": version}).scalar()
+            if done:
+                continue
+
+            # Raw driver SQL: files hold several statements and literal colons
+            conn.exec_driver_sql(path.read_text())
+            conn.execute(text("""
+                INSERT INTO schema_migrations (version) VALUES (:version)
+            """), {"version": version})
+        applied.append(version)
+    return applied
@@ -0,0 +1,161 @@
+import json
+from collections import deque
+from functools import lru_cache
+
+from .ingest import iter_batches, map_file, open_buffer_rows
+from .rule_engine import compile_rules, validate_rows
+from . import vector_engine
+
+# Shards smaller than this cost more in pickling than they save in CPU
+MIN_SHARD_ROWS = 100
+
+
+@lru_cache(maxsize=32)
+def _plan_for(rule_map_json):
+    # Compiled once per worker process for each distinct rule map
+    return compile_rules(json.loads(rule_map_json))
+
+
+def _failed_indices(rule_map_json, engine, rows):
+    """
+    Validate rows and return, per row, the plan indices of the rules it
+    failed (compiled validators themselves are not picklable).
+    """
+    plan = _plan_for(rule_map_json)
+    if engine == "vector":
+        failed = vector_engine.validate_rows(plan, rows)
+    else:
+        failed = validate_rows(plan, rows)
+
+    index = {}
+    for idx, rule in enumerate(plan):
+        index.setdefault(rule, idx)
+    return [[index[rule] for rule in row_failed] for row_failed in failed]
+
+
+def _validate_shard(rule_map_json, engine, rows):
+    """Runs in a worker process: validates rows pickled from the caller."""
+    return _failed_indices(rule_map_json, engine, rows)
+
+
+def _validate_csv_range(rule_map_json, engine, path, columns, start, end, chunk_rows):
+    """
+    Runs in a worker process: parses the CSV records in bytes [start, end)
+    of the file at `path` through its own memory map and validates them,
+    chunk_rows rows at a time.
+    Returns (row count, [(row index in the range, failed indices), ...])
+    with an entry for failing rows only.
+    """
+    count = 0
+    failures = []
+    with open(path, "rb") as spooled, map_file(spooled) as buffer:
+        for rows in iter_batches(open_buffer_rows(buffer, start, end, columns), chunk_rows):
+            for offset, row_failed in enumerate(_failed_indices(rule_map_json, engine, rows)):
+                if row_failed:
+                    failures.append((count + offset, row_failed))
+            count += len(rows)
+    return count, failures
+
+
+class ParallelValidator:
+    """
+    Validates batches of rows across a ProcessPoolExecutor.
+
+    Each batch is split into up to `workers` contiguous row-range shards;
+    results are merged back in row order, so the output matches
+    rule_engine.validate_rows.
+
+    Args:
+        executor: ProcessPoolExecutor shared across jobs
+        rule_map: {column_name: [{"type": ..., "value": ...}, ...]}
+        workers: Shards per batch, and batches in flight for validate_batches
+        engine: "row" or "vector", the engine each worker runs
+    """
+
+    def __init__(self, executor, rule_map, workers, engine="row"):
+        self.executor = executor
+        self.workers = workers
+        self.engine = engine
+        self.plan = compile_rules(rule_map)
+        self._rule_map_json = json.dumps(rule_map)
+
+    def _submit(self, rows):
+        """Split rows into up to `workers` shards and submit them; returns the futures."""
+        shard_count = max(1, min(self.workers, -(-len(rows) // MIN_SHARD_ROWS)))
+        shard_size = -(-len(rows) // shard_count)
+        return [
+            self.executor.submit(_validate_shard, self._rule_map_json, self.engine, rows[start:start + shard_size])
+            for start in range(0, len(rows), shard_size)
+        ]
+
+    def _merge(self, futures):
+        plan = self.plan
+        merged = []
+        for future in futures:
+            merged.extend([plan[idx] for idx in row_failed] for row_failed in future.result())
+        return merged
+
+    def validate_rows(self, rows):
+        """Returns one list of failed CompiledRule entries per row, in input order."""
+        if not rows:
+            return []
+        return self._merge(self._submit(rows))
+
+    def validate_batches(self, batches):
+        """
+        Validate an iterable of row lists, keeping up to `workers` batches
+        in flight so the pool stays busy while the caller persists earlier
+        ones. Yields (batch, failed CompiledRule lists per row) in order.
+        """
+        pending = deque()
+        batches = iter(batches)
+        while True:
+            while len(pending) < self.workers:
+                batch = next(batches, None)
+                if batch is None:
+                    break
+                pending.append((batch, self._submit(batch)))
+            if not pending:
+                return
+            batch, futures = pending.popleft()
+            yield batch, self._merge(futures)
+
+    def validate_csv_ranges(self, buffer, path, columns, ranges, batch_size, max_pending_bytes):
+        """
+        Validate byte ranges of a CSV file (see ingest.split_line_ranges)
+        in the workers, which parse the file at `path` themselves and send
+        back only the indices of failing rows and the rules they failed.
+        Rows are re-parsed here from `buffer`, the caller's map of the same
+        file, one batch at a time.
+
+        Ranges are submitted while fewer than two per worker, and fewer than
+        max_pending_bytes of the file, are in flight (always at least one).
+        Yields (batch of at most batch_size row dicts, failed CompiledRule
+        lists per row) in file order.
+        """
+        plan = self.plan
+        pending = deque()
+        pending_bytes = 0
+        ranges = iter(ranges)
+        byte_range = next(ranges, None)
+        while True:
+            while byte_range is not None and len(pending) < 2 * self.workers and (
+                    not pending or pending_bytes + byte_range[1] - byte_range[0] <= max_pending_bytes):
+                pending.append((byte_range, self.executor.submit(
+                    _validate_csv_range, self._rule_map_json, self.engine, path, columns, *byte_range, batch_size
+                )))
+                pending_bytes += byte_range[1] - byte_range[0]
+                byte_range = next(ranges, None)
+            if not pending:
+                return
+            (start, end), future = pending.popleft()
+            count, failures = future.result()
+            pending_bytes -= end - start
+
+            failed = dict(failures)
+            offset = 0
+            for rows in iter_batches(open_buffer_rows(buffer, start, end, columns), batch_size):
+                yield rows, [[plan[idx] for idx in failed.get(offset + i, ())] for i in range(len(rows))]
+                offset += len(rows)
+            if offset != count:
+                raise ValueError(f"CSV bytes {start}-{end} parsed to {offset} rows here but {count} in a worker")
@@ -0,0 +1,155 @@
+from sqlalchemy import text
+
+# Tables that may be LIST-partitioned by job_id, one partition per job
+PARTITIONABLE_TABLES = ("logs", "clean_data", "quarantine_data")
+
+
+def is_partitioned(conn, table_name):
+    """True when table_name is a partitioned (parent) table."""
+    return conn.execute(text("""
+        SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table_name)
+    """), {"table_name": table_name}).scalar() is not None
+
+
+def job_partition(table_name, job_id):
+    """Name of the partition holding one job's rows."""
+    return f"{table_name}_job_{int(job_id)}"
+
+
+def partition_by_job(conn, table_name):
+    """
+    Convert a table into one LIST-partitioned by job_id. Safe to run repeatedly.
+
+    Existing rows are not copied: the old table becomes the DEFAULT partition
+    (<table>_legacy), with a CHECK limiting it to jobs that already exist.
+    That CHECK lets PostgreSQL attach partitions for new jobs without
+    scanning the old rows. Non-unique indexes are recreated on the parent.
+    The old primary key stays on the legacy table only, because a
+    partitioned table's primary key must include job_id.
+
+    CHECK constraints move to the parent as they are (NOT VALID stays NOT
+    VALID). PostgreSQL has no NOT VALID foreign keys on partitioned tables,
+    so a NOT VALID foreign key is validated against the legacy rows first;
+    if they break it, it stays on the legacy partition and each new job
+    partition gets its own copy (see create_job_partitions).
+
+    Returns:
+        True if the table was converted by this call
+    """
+    legacy = f"{table_name}_legacy"
+    if is_partitioned(conn, table_name):
+        # Tables partitioned before constraints were carried over
+        for name, definition in table_constraints(conn, legacy, "c"):
+            if name == f"{legacy}_job_id_check":
+                continue
+            if not conn.execute(text("""
+                SELECT 1 FROM pg_constraint WHERE conrelid = CAST(:table_name AS regclass) AND conname = :name
+            """), {"table_name": table_name, "name": name}).scalar():
+                conn.exec_driver_sql(f"ALTER TABLE {table_name} ADD CONSTRAINT {name} {not_valid(definition)}")
+        return False
+
+    constraints = conn.execute(text("""
+        SELECT conname, contype, convalidated, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = CAST(:table_name AS regclass) AND contype IN ('c', 'f')
+    """), {"table_name": table_name}).fetchall()
+    indexes = conn.execute(text("""
+        SELECT i.relname, pg_get_indexdef(i.oid)
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = CAST(:table_name AS regclass) AND NOT x.indisunique
+    """), {"table_name": table_name}).fetchall()
+    sequence = conn.execute(text("SELECT pg_get_serial_sequence(:table_name, 'id')"),
+                            {"table_name": table_name}).scalar()
+    last_job_id = int(conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM jobs")).scalar())
+
+    conn.exec_driver_sql(f"ALTER TABLE {table_name} RENAME TO {legacy}")
+    for index_name, _ in indexes:
+        conn.exec_driver_sql(f"ALTER INDEX {index_name} RENAME TO {index_name}_legacy")
+
+    conn.exec_driver_sql(f"""
+        CREATE TABLE {table_name} (LIKE {legacy} INCLUDING DEFAULTS)
+        PARTITION BY LIST (job_id)
+    """)
+    # Definitions still name the original table, which is now the parent
+    for _, definition in indexes:
+        conn.exec_driver_sql(definition)
+    # Rows are still looked up by id alone (quarantine edits, single-row revalidation)
+    if table_name != "logs":
+        conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS idx_{table_name}_id ON {table_name} (id)")
+    if sequence:
+        conn.exec_driver_sql(f"ALTER SEQUENCE {sequence} OWNED BY {table_name}.id")
+
+    for name, contype, validated, definition in constraints:
+        if contype == "f" and not validated:
+            try:
+                with conn.begin_nested():
+                    conn.exec_driver_sql(f"ALTER TABLE {legacy} VALIDATE CONSTRAINT {name}")
+            except Exception:
+                continue
+            definition = definition.replace(" NOT VALID", "")
+        # Attaching the legacy table reuses its matching constraints
+        conn.exec_driver_sql(f"ALTER TABLE {table_name} ADD CONSTRAINT {name} {definition}")
+
+    conn.exec_driver_sql(f"""
+        ALTER TABLE {legacy} ADD CONSTRAINT {legacy}_job_id_check
+        CHECK (job_id IS NULL OR job_id <= {last_job_id})
+    """)
+    conn.exec_driver_sql(f"ALTER TABLE {table_name} ATTACH PARTITION {legacy} DEFAULT")
+    return True
+
+
+def table_constraints(conn, table_name, contype):
+    """
+    (name, definition) of table_name's own constraints of one type ('c'
+    CHECK, 'f' foreign key), leaving out those inherited from a parent.
+    """
+    return conn.execute(text("""
+        SELECT conname, pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = to_regclass(:table_name) AND contype = :contype AND conparentid = 0 AND conislocal
+    """), {"table_name": table_name, "contype": contype}).fetchall()
+
+
+def not_valid(definition):
+    """A constraint definition that skips checking existing rows."""
+    return definition if definition.endswith(" NOT VALID") else f"{definition} NOT VALID"
+
+
+def create_job_partitions(conn, job_id, tables=PARTITIONABLE_TABLES):
+    """
+    Create the partition for a new job in every partitioned table among tables.
+
+    Foreign keys the parent could not take (legacy rows break them) are
+    added to the new, empty partition directly.
+    """
+    for table_name in tables:
+        if is_partitioned(conn, table_name):
+            partition = job_partition(table_name, job_id)
+            if conn.execute(text("SELECT to_regclass(:partition)"), {"partition": partition}).scalar() is not None:
+                continue
+            conn.exec_driver_sql(f"""
+                CREATE TABLE {partition}
+                PARTITION OF {table_name} FOR VALUES IN ({int(job_id)})
+            """)
+            for name, definition in table_constraints(conn, f"{table_name}_legacy", "f"):
+                conn.exec_driver_sql(f"ALTER TABLE {partition} ADD CONSTRAINT {name} {definition.replace(' NOT VALID', '')}")
+
+
+def clear_job_rows(conn, table_name, job_id, drop=False):
+    """
+    Remove all of a job's rows from table_name.
+
+    With a partition for the job this is a TRUNCATE, or a DROP of the
+    partition when drop=True (the job is going away). Jobs in the legacy
+    partition, or unpartitioned tables, fall back to DELETE.
+    """
+    partition = job_partition(table_name, job_id)
+    has_partition = conn.execute(text("SELECT to_regclass(:partition)"), {"partition": partition}).scalar()
+
+    if has_partition is None:
+        conn.execute(text(f"DELETE FROM {table_name} WHERE job_id = :job_id"), {"job_id": job_id})
+    elif drop:
+        conn.exec_driver_sql(f"DROP TABLE {partition}")
+    else:
+        conn.exec_driver_sql(f"TRUNCATE {partition}")
@@ -0,0 +1,222 @@
+import io
+import json
+
+from sqlalchemy import column, insert, table, text
+
+# Rows buffered per table before an automatic flush
+DEFAULT_BATCH_SIZE = 1000
+
+# Supported flush strategies: multi-row INSERT via executemany, or COPY FROM STDIN
+WRITE_METHODS = ("executemany", "copy")
+
+# Log granularity: "row" writes one green log per clean row; "summary" stores
+# runs of clean rows in log_green_ranges and keeps only red logs per row
+LOG_GRANULARITIES = ("row", "summary")
+
+clean_data_table = table(
+    "clean_data",
+    column("job_id"), column("row_number"), column("name"), column("age"),
+    column("row_data"), column("failed_rules"),
+)
+
+quarantine_data_table = table(
+    "quarantine_data",
+    column("job_id"), column("row_number"), column("name"), column("age"),
+    column("error_reason"), column("row_data"), column("failed_rules"),
+)
+
+logs_table = table(
+    "logs",
+    column("job_id"), column("row_number"), column("column_name"),
+    column("original_value"), column("rule_applied"), column("status_color"),
+)
+
+log_green_ranges_table = table(
+    "log_green_ranges",
+    column("job_id"), column("first_row"), column("last_row"),
+)
+
+_TABLES = (clean_data_table, quarantine_data_table, logs_table, log_green_ranges_table)
+
+
+def failed_rules_json(failed_rules):
+    """Serialize failed CompiledRule entries as [[column, rule_type], ...] for failed_rules."""
+    return json.dumps([[rule.column, rule.type] for rule in failed_rules])
+
+
+def coerce_age(value):
+    """Map a raw age cell onto the fixed INT column (non-digits become 0)."""
+    return int(value) if str(value).isdigit() else 0
+
+
+def _copy_field(value):
+    """Encode a value for PostgreSQL's COPY text format."""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class BatchWriter:
+    """
+    Buffers clean_data, quarantine_data and logs rows for one job and
+    writes them in bulk instead of one INSERT per row.
+
+    Args:
+        conn: SQLAlchemy connection (the caller owns the transaction)
+        job_id: Job the buffered rows belong to
+        batch_size: Rows buffered per table before flushing
+        method: "executemany" (multi-row INSERT) or "copy" (COPY FROM STDIN)
+        log_granularity: "row" or "summary" (green logs collapsed into row ranges)
+    """
+
+    def __init__(self, conn, job_id, batch_size=DEFAULT_BATCH_SIZE, method="executemany", log_granularity="row"):
+        if method not in WRITE_METHODS:
+            raise ValueError(f"Unknown write method '{method}', expected one of {WRITE_METHODS}")
+        if log_granularity not in LOG_GRANULARITIES:
+            raise ValueError(f"Unknown log granularity '{log_granularity}', expected one of {LOG_GRANULARITIES}")
+        self.conn = conn
+        self.job_id = job_id
+        self.batch_size = batch_size
+        self.method = method
+        self.log_granularity = log_granularity
+        self._buffers = {target.name: [] for target in _TABLES}
+        # [first_row, last_row] runs of green rows, written on flush
+        self._green_ranges = []
+
+    def add_clean(self, row_number, row):
+        self._add(clean_data_table, {
+            "job_id": self.job_id,
+            "row_number": row_number,
+            "name": row.get("name", ""),
+            "age": coerce_age(row.get("age", "")),
+            "row_data": json.dumps(dict(row)),
+            "failed_rules": "[]",
+        })
+
+    def add_quarantine(self, row_number, row, error_reason, failed_rules="[]"):
+        self._add(quarantine_data_table, {
+            "job_id": self.job_id,
+            "row_number": row_number,
+            "name": row.get("name", ""),
+            "age": coerce_age(row.get("age", "")),
+            "error_reason": error_reason,
+            "row_data": json.dumps(dict(row)),
+            "failed_rules": failed_rules,
+        })
+
+    def add_log(self, row_number, status_color, column_name=None, original_value=None, rule_applied=None):
+        if self.log_granularity == "summary" and status_color == "green" and column_name is None:
+            self._add_green_row(row_number)
+            return
+        self._add(logs_table, {
+            "job_id": self.job_id,
+            "row_number": row_number,
+            "column_name": column_name,
+            "original_value": original_value,
+            "rule_applied": rule_applied,
+            "status_color": status_color,
+        })
+
+    def _add_green_row(self, row_number):
+        ranges = self._green_ranges
+        if ranges and ranges[-1][1] == row_number - 1:
+            ranges[-1][1] = row_number
+        else:
+            ranges.append([row_number, row_number])
+
+    def _add(self, target, params):
+        buffer = self._buffers[target.name]
+        buffer.append(params)
+        if len(buffer) >= self.batch_size:
+            self._flush_table(target)
+
+    def flush(self):
+        """Write every buffered row. Call before the surrounding transaction commits."""
+        self._buffers[log_green_ranges_table.name].extend(
+            {"job_id": self.job_id, "first_row": first, "last_row": last}
+            for first, last in self._green_ranges
+        )
+        self._green_ranges = []
+        for target in _TABLES:
+            self._flush_table(target)
+
+    def _flush_table(self, target):
+        buffer = self._buffers[target.name]
+        if not buffer:
+            return
+        if self.method == "copy":
+            self._copy_rows(target, buffer)
+        else:
+            self.conn.execute(insert(target), buffer)
+        self._buffers[target.name] = []
+
+    def _copy_rows(self, target, rows):
+        names = [c.name for c in target.columns]
+        payload = io.StringIO()
+        for params in rows:
+            payload.write("\t".join(_copy_field(params[name]) for name in names))
+            payload.write("\n")
+        payload.seek(0)
+
+        # COPY is driver-level; it runs on the same DBAPI connection and transaction
+        cursor = self.conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {target.name} ({', '.join(names)}) FROM STDIN",
+                payload,
+            )
+        finally:
+            cursor.close()
+
+
+def split_ranges(ranges, row_numbers):
+    """
+    Remove row numbers from a list of inclusive (first, last) ranges.
+
+    Returns:
+        The remaining ranges, in order
+    """
+    remaining = []
+    removed = sorted(set(row_numbers))
+    for first, last in ranges:
+        start = first
+        for row_number in removed:
+            if row_number < start or row_number > last:
+                continue
+            if row_number > start:
+                remaining.append((start, row_number - 1))
+            start = row_number + 1
+        if start <= last:
+            remaining.append((start, last))
+    return remaining
+
+
+def remove_green_rows(conn, job_id, row_numbers):
+    """
+    Drop row numbers from a job's log_green_ranges (rows that no longer pass),
+    splitting the runs that contained them.
+    """
+    if not row_numbers:
+        return
+    affected = conn.execute(text("""
+        SELECT id, first_row, last_row
+        FROM log_green_ranges g
+        WHERE job_id = :job_id
+          AND EXISTS (SELECT 1 FROM unnest(CAST(:row_numbers AS INT[])) r WHERE r BETWEEN g.first_row AND g.last_row)
+    """), {"job_id": job_id, "row_numbers": list(row_numbers)}).fetchall()
+    if not affected:
+        return
+
+    conn.execute(text("DELETE FROM log_green_ranges WHERE id = ANY(:ids)"), {"ids": [r[0] for r in affected]})
+    remaining = split_ranges([(r[1], r[2]) for r in affected], row_numbers)
+    if remaining:
+        conn.execute(insert(log_green_ranges_table), [
+            {"job_id": job_id, "first_row": first, "last_row": last}
+            for first, last in remaining
+        ])
@@ -0,0 +1,138 @@
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """
+    Counters for one engine's connection pool, reported by GET /metrics.
+
+    Args:
+        leak_seconds: Checkouts held longer than this are reported as possible leaks
+    """
+
+    def __init__(self, leak_seconds=60.0):
+        self.leak_seconds = leak_seconds
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        # id(connection record) -> (checkout time, thread name). Keyed by the
+        # pool's record, since checkin after an invalidation has no dbapi connection
+        self._held = {}
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def install(self, engine):
+        """Attach to engine's pool events (and to an InstrumentedQueuePool's wait timing)."""
+        engine.pool.metrics = self
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_conn, record):
+            with self._lock:
+                self.connects += 1
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_conn, record, proxy):
+            with self._lock:
+                self.checkouts += 1
+                self._held[id(record)] = (time.monotonic(), threading.current_thread().name)
+
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_conn, record):
+            with self._lock:
+                self.checkins += 1
+                self._held.pop(id(record), None)
+
+        @event.listens_for(engine, "detach")
+        def on_detach(dbapi_conn, record):
+            # A detached connection leaves the pool and is never checked in
+            with self._lock:
+                self._held.pop(id(record), None)
+
+        @event.listens_for(engine, "invalidate")
+        def on_invalidate(dbapi_conn, record, exception):
+            with self._lock:
+                self.invalidations += 1
+
+        return self
+
+    def snapshot(self, pool):
+        """Current pool state plus counters, as a JSON-ready dict."""
+        now = time.monotonic()
+        with self._lock:
+            long_held = sorted(
+                ({"held_seconds": round(now - since, 3), "thread": thread}
+                 for since, thread in self._held.values()
+                 if now - since > self.leak_seconds),
+                key=lambda held: -held["held_seconds"]
+            )
+            return {
+                "pool": {
+                    "class": type(pool).__name__,
+                    "size": pool.size() if hasattr(pool, "size") else None,
+                    "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+                    "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+                    "overflow": pool.overflow() if hasattr(pool, "overflow") else None,
+                },
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait": {
+                    "count": self.wait_count,
+                    "total_seconds": round(self.wait_total, 6),
+                    "avg_ms": round(1000 * self.wait_total / self.wait_count, 3) if self.wait_count else 0.0,
+                    "max_ms": round(1000 * self.wait_max, 3),
+                },
+                "leaks": {
+                    "threshold_seconds": self.leak_seconds,
+                    "long_held": long_held,
+                },
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that times how long each checkout waits for a connection
+    (including opening a new one) and counts pool timeouts.
+
+    Wraps QueuePool._do_get, the one place a checkout blocks; there is no
+    pool event for it.
+    """
+
+    metrics = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; keep counting into the same metrics
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
@@ -0,0 +1,270 @@
+import json
+import re
+import warnings
+from collections import namedtuple
+
+from sqlalchemy import exc, text
+
+# A rule translated to SQL. `predicate` is TRUE (pass), FALSE (fail) or NULL
+# (undecided: the row must be checked in Python); `params` are its bind values
+PushedRule = namedtuple("PushedRule", ["index", "rule", "predicate", "params"])
+
+# pushed: PushedRule per rule checked in PostgreSQL
+# fallback: CompiledRule entries that only Python can check
+PushdownPlan = namedtuple("PushdownPlan", ["pushed", "fallback"])
+
+# Python's re and PostgreSQL's regex engine agree on printable ASCII without
+# newlines (\d, \w, \s and $ differ on Unicode and line breaks); other values
+# are left undecided
+_SQL_PRINTABLE = "'^[ -~]*$'"
+
+# What int() accepts, for printable ASCII: padding spaces, a sign, and digits
+# with single underscores between them
+_SQL_INT_SYNTAX = "'^ *[+-]?[0-9](_?[0-9])* *$'"
+
+# PostgreSQL rejects repetition bounds above 255
+_MAX_REPEAT = 255
+
+_CLASS_ESCAPES = set("dDsSwW")
+_QUANTIFIER = re.compile(r"\{(\d+)(?:,(\d*))?\}")
+
+
+def _bracket_end(pattern, start):
+    """
+    Index just past the bracket expression opening at `start`, or None when
+    it uses syntax the two engines read differently.
+    """
+    i = start + 1
+    if i < len(pattern) and pattern[i] == "^":
+        i += 1
+    first = True
+    previous_literal = False
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "]" and not first:
+            return i + 1
+        if char in "[]":
+            # POSIX classes like [:alpha:] exist only in PostgreSQL; a leading ] is literal only in Python
+            return None
+        if char == "\\":
+            if i + 1 >= len(pattern):
+                return None
+            escaped = pattern[i + 1]
+            if escaped in "dsw":
+                # PostgreSQL allows \d, \s, \w in brackets but not next to a range dash
+                if pattern[i + 2:i + 3] == "-" and pattern[i + 3:i + 4] != "]":
+                    return None
+                previous_literal = False
+            elif escaped.isalnum() or not escaped.isascii():
+                return None
+            else:
+                # Escaped punctuation; kept out of ranges, where the engines differ
+                previous_literal = False
+            i += 2
+        elif char == "-" and not first and pattern[i + 1:i + 2] != "]":
+            # A range: both ends must be literal characters
+            if not previous_literal or pattern[i + 1:i + 2] in ("\\", "[", ""):
+                return None
+            i += 2
+            previous_literal = False
+        else:
+            previous_literal = True
+            i += 1
+        first = False
+    return None
+
+
+def regex_pushable(pattern):
+    """
+    True when PostgreSQL's `~` anchored at the start gives the same answer as
+    Python's re.match for `pattern` on printable ASCII values.
+
+    Only a common subset is accepted: literals, escaped punctuation, \\d \\s \\w
+    (and negations), bracket expressions, ., ^, $, |, plain and (?:) groups,
+    and the quantifiers * + ? {m,n} (optionally lazy).
+    """
+    if not pattern.isascii():
+        return False
+    try:
+        with warnings.catch_warnings():
+            # Python warns on syntax whose meaning may change, e.g. possible nested sets
+            warnings.simplefilter("error", FutureWarning)
+            re.compile(pattern)
+    except (re.error, FutureWarning):
+        return False
+
+    i = 0
+    # Whether the previous token can take a quantifier, and whether a branch is empty so far
+    quantifiable = False
+    empty_branch = True
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            escaped = pattern[i + 1:i + 2]
+            if not escaped or (escaped.isalnum() and escaped not in _CLASS_ESCAPES):
+                # Backreferences, \b, \A, \Z, \n ... mean different things or nothing in PostgreSQL
+                return False
+            i += 2
+            quantifiable, empty_branch = True, False
+        elif char == "[":
+            end = _bracket_end(pattern, i)
+            if end is None:
+                return False
+            i = end
+            quantifiable, empty_branch = True, False
+        elif char == "(":
+            if pattern.startswith("(?", i):
+                if not pattern.startswith("(?:", i):
+                    # Named groups, lookarounds and inline flags
+                    return False
+                i += 3
+            else:
+                i += 1
+            quantifiable, empty_branch = False, True
+        elif char in "|)":
+            if empty_branch:
+                return False
+            i += 1
+            quantifiable, empty_branch = char == ")", char == "|"
+        elif char in "*+?{":
+            if not quantifiable:
+                return False
+            if char == "{":
+                match = _QUANTIFIER.match(pattern, i)
+                if match is None:
+                    return False
+                low, high = match.group(1), match.group(2)
+                if int(low) > _MAX_REPEAT or (high and int(high) > _MAX_REPEAT):
+                    return False
+                i = match.end()
+            else:
+                i += 1
+            if pattern[i:i + 1] == "?":
+                i += 1
+            if pattern[i:i + 1] in ("*", "+", "?", "{"):
+                # Stacked and possessive quantifiers
+                return False
+            quantifiable = False
+        elif char in "]}":
+            return False
+        else:
+            # Literal character, ., ^ or $
+            i += 1
+            quantifiable, empty_branch = char not in "^$", False
+    return not empty_branch
+
+
+def _range_bounds(rule_value):
+    try:
+        min_val, max_val = rule_value.split("-")
+        return int(min_val), int(max_val)
+    except Exception:
+        return None
+
+
+def rule_predicate(rule, value_sql, prefix):
+    """
+    Translate one CompiledRule into a SQL check of the text value `value_sql`.
+
+    Returns:
+        (predicate, params), or None when the rule cannot be pushed down
+    """
+    if rule.type == "regex":
+        if not regex_pushable(rule.value):
+            return None
+        predicate = f"CASE WHEN {value_sql} ~ {_SQL_PRINTABLE} THEN {value_sql} ~ :{prefix}_pattern END"
+        return predicate, {f"{prefix}_pattern": f"^(?:{rule.value})"}
+
+    if rule.type == "range":
+        bounds = _range_bounds(rule.value)
+        if bounds is None:
+            # Same as make_validator: a malformed range rejects every value
+            return "FALSE", {}
+        low, high = bounds
+        # NUMERIC, so values and bounds of any size compare exactly
+        predicate = (
+            f"CASE WHEN {value_sql} !~ {_SQL_PRINTABLE} THEN NULL "
+            f"WHEN {value_sql} ~ {_SQL_INT_SYNTAX} "
+            f"THEN CAST(replace(btrim({value_sql}), '_', '') AS NUMERIC) BETWEEN :{prefix}_low AND :{prefix}_high "
+            f"ELSE FALSE END"
+        )
+        return predicate, {f"{prefix}_low": low, f"{prefix}_high": high}
+
+    # Unknown rule types accept every value
+    return "TRUE", {}
+
+
+def _verify_patterns(conn, pushed):
+    """
+    Compile each pushed regex in PostgreSQL once, inside a savepoint, so a
+    pattern it refuses (e.g. too complex) falls back to Python instead of
+    aborting the caller's transaction.
+    """
+    verified = []
+    for entry in pushed:
+        patterns = [value for name, value in entry.params.items() if name.endswith("_pattern")]
+        try:
+            for pattern in patterns:
+                with conn.begin_nested():
+                    conn.execute(text("SELECT '' ~ :pattern"), {"pattern": pattern})
+        except exc.DBAPIError:
+            continue
+        verified.append(entry)
+    return verified
+
+
+def plan_pushdown(plan, data_sql="data", conn=None):
+    """
+    Split a compiled rule plan into rules PostgreSQL can check and rules left to Python.
+
+    Each pushed predicate reads the JSONB expression `data_sql`: a row without
+    the column passes (as in validate_row), a non-string value is undecided,
+    and otherwise the translated rule decides, or leaves it undecided when
+    the two engines might disagree on that value.
+
+    Args:
+        plan: Compiled rule plan from rule_engine.compile_rules
+        data_sql: SQL expression for the row's JSONB data
+        conn: Optional connection; when given, pushed regexes are test-compiled on it
+
+    Returns:
+        PushdownPlan
+    """
+    pushed, fallback = [], []
+    for index, rule in enumerate(plan):
+        prefix = f"r{index}"
+        translated = rule_predicate(rule, f"({data_sql} ->> :{prefix}_column)", prefix)
+        if translated is None:
+            fallback.append(rule)
+            continue
+        check, params = translated
+        predicate = (
+            f"CASE WHEN {data_sql} -> :{prefix}_column IS NULL THEN TRUE "
+            f"WHEN jsonb_typeof({data_sql} -> :{prefix}_column) <> 'string' THEN NULL "
+            f"ELSE {check} END"
+        )
+        params[f"{prefix}_column"] = rule.column
+        pushed.append(PushedRule(index, rule, predicate, params))
+
+    if conn is not None:
+        verified = _verify_patterns(conn, pushed)
+        fallback.extend(entry.rule for entry in pushed if entry not in verified)
+        pushed = verified
+    return PushdownPlan(pushed, fallback)
+
+
+def plan_params(pushdown_plan):
+    """Bind values for every pushed predicate, merged into one dict."""
+    params = {}
+    for entry in pushdown_plan.pushed:
+        params.update(entry.params)
+    return params
+
+
+def failure_fragments(entry):
+    """
+    Literal pieces a pushed rule contributes when it fails: its failed_rules
+    element (as failed_rules_json writes it) and its error message.
+    """
+    rule = entry.rule
+    return json.dumps([rule.column, rule.type]), f"Column '{rule.column}' failed {rule.type} rule"
@@ -1,25 +1,157 @@
 import re
+from collections import namedtuple
+from functools import lru_cache
 
-def apply_rule(value, rule_type, rule_value):
+# One validator of a compiled rule plan: check(value) -> bool
+CompiledRule = namedtuple("CompiledRule", ["column", "type", "value", "check"])
+
+
+def _always_valid(value):
+    return True
+
+
+def _never_valid(value):
+    return False
+
+
+@lru_cache(maxsize=1024)
+def make_validator(rule_type, rule_value):
     """
-    Apply validation rule to a value.
-    
+    Build a validator callable for a single rule.
+
+    The rule definition is parsed once (regex compiled, range bounds
+    converted to ints) and cached, so repeated calls are cheap.
+
     Args:
-        value: The value to validate
         rule_type: Type of rule ("regex", "range", etc.)
         rule_value: The rule definition
-        
+
     Returns:
-        Boolean indicating if value passes the rule
+        Callable taking a value and returning True if it passes the rule
     """
     if rule_type == "regex":
-        return bool(re.match(rule_value, str(value)))
+        pattern = re.compile(rule_value)
+        return lambda value: pattern.match(str(value)) is not None
 
     if rule_type == "range":
         try:
             min_val, max_val = rule_value.split("-")
-            return int(min_val) <= int(value) <= int(max_val)
-        except:
-            return False
+            low, high = int(min_val), int(max_val)
+        except Exception:
+            # A malformed range rejects every value
+            return _never_valid
 
-    return True
+        def check_range(value):
+            try:
+                return low <= int(value) <= high
+            except Exception:
+                return False
+
+        return check_range
+
+    return _always_valid
+
+
+def apply_rule(value, rule_type, rule_value):
+    """
+    Apply validation rule to a value.
+
+    Args:
+        value: The value to validate
+        rule_type: Type of rule ("regex", "range", etc.)
+        rule_value: The rule definition
+
+    Returns:
+        Boolean indicating if value passes the rule
+    """
+    return make_validator(rule_type, rule_value)(value)
+
+
+def build_rule_map(rules, custom_rules=None):
+    """
+    Merge active system rules with per-upload overrides.
+
+    Args:
+        rules: Rows of (column_name, rule_type, rule_value) from the rules table
+        custom_rules: Optional {column_name: {"type": ..., "value": ...}} overrides.
+            An override replaces the system rules for its column; an empty
+            override disables them.
+
+    Returns:
+        {column_name: [{"type": ..., "value": ...}, ...]}
+    """
+    custom_rules = custom_rules or {}
+    rule_map = {}
+    for column_name, rule_type, rule_value in rules:
+        if column_name in custom_rules:
+            custom_rule = custom_rules[column_name]
+            if custom_rule and custom_rule.get("type"):
+                rule_map.setdefault(column_name, []).append({
+                    "type": custom_rule["type"],
+                    "value": custom_rule.get("value", "")
+                })
+        else:
+            rule_map.setdefault(column_name, []).append({
+                "type": rule_type,
+                "value": rule_value
+            })
+
+    # Custom rules for columns that have no system rule
+    for column_name, custom_rule in custom_rules.items():
+        if column_name not in rule_map and custom_rule and custom_rule.get("type"):
+            rule_map[column_name] = [{
+                "type": custom_rule["type"],
+                "value": custom_rule.get("value", "")
+            }]
+
+    return rule_map
+
+
+def compile_rules(rule_map):
+    """
+    Turn a rule map into a reusable plan of prebuilt validators.
+
+    Args:
+        rule_map: {column_name: [{"type": ..., "value": ...}, ...]}
+
+    Returns:
+        List of CompiledRule, in rule_map order
+    """
+    return [
+        CompiledRule(column, rule["type"], rule["value"], make_validator(rule["type"], rule["value"]))
+        for column, rules_list in rule_map.items()
+        for rule in rules_list
+    ]
+
+
+def validate_row(plan, row):
+    """
+    Run a compiled plan against one row.
+
+    Columns missing from the row are skipped.
+
+    Returns:
+        List of the CompiledRule entries the row failed (empty if valid)
+    """
+    return [rule for rule in plan if rule.column in row and not rule.check(row[rule.column])]
+
+
+def validate_rows(plan, rows):
+    """
+    Run a compiled plan against a batch of rows, one row at a time.
+
+    Returns:
+        One list of failed CompiledRule entries per row
+    """
+    return [validate_row(plan, row) for row in rows]
+
+
+def changed_columns(previous_rule_map, current_rule_map):
+    """
+    Columns whose rules differ between two rule maps (added, removed or edited).
+
+    Returns:
+        Set of column names
+    """
+    columns = set(previous_rule_map) | set(current_rule_map)
+    return {c for c in columns if previous_rule_map.get(c) != current_rule_map.get(c)}
@@ -0,0 +1,133 @@
+import select
+import threading
+
+from sqlalchemy import text
+
+from .rule_engine import build_rule_map
+
+# NOTIFY channel announcing that the rules table changed
+RULES_CHANNEL = "rules_changed"
+
+# Seconds between checks of the stop flag while waiting for notifications,
+# and before reconnecting after the listener connection drops
+LISTEN_POLL_SECONDS = 5
+
+
+def notify_rules_changed(conn, channel=RULES_CHANNEL):
+    """
+    Queue a notification on conn's transaction; PostgreSQL delivers it to
+    every listening process when the transaction commits.
+    """
+    conn.execute(text("SELECT pg_notify(:channel, '')"), {"channel": channel})
+
+
+class RulesCache:
+    """
+    Process-wide cache of the active rules and the system rule map built from them.
+
+    Loaded on first use and dropped by invalidate(). Rule mutations call
+    notify_rules_changed() in their transaction; start_listener() runs a
+    LISTEN thread so every worker process invalidates on commit.
+
+    Args:
+        engine: SQLAlchemy engine for the rules table
+        channel: NOTIFY channel to listen on
+    """
+
+    def __init__(self, engine, channel=RULES_CHANNEL):
+        self.engine = engine
+        self.channel = channel
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._rules = None
+        self._rule_map = None
+        self._stop = threading.Event()
+        self._listener = None
+
+    def rules(self):
+        """Active rules as a tuple of (column_name, rule_type, rule_value)."""
+        return self._load()[0]
+
+    def rule_map(self, custom_rules=None):
+        """
+        Rule map for validation, as build_rule_map returns it. The map without
+        custom rules is shared; callers must not modify it.
+        """
+        rules, rule_map = self._load()
+        if custom_rules:
+            return build_rule_map(rules, custom_rules)
+        return rule_map
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._rules = None
+            self._rule_map = None
+
+    def _load(self):
+        with self._lock:
+            if self._rules is not None:
+                return self._rules, self._rule_map
+            generation = self._generation
+
+        with self.engine.connect() as conn:
+            rules = tuple(tuple(r) for r in conn.execute(text("""
+                SELECT column_name, rule_type, rule_value
+                FROM rules
+                WHERE is_active = TRUE
+                ORDER BY id
+            """)))
+        rule_map = build_rule_map(rules)
+
+        with self._lock:
+            # An invalidation during the load means these rows may be stale:
+            # use them for this call only, and load again next time
+            if self._generation == generation:
+                self._rules = rules
+                self._rule_map = rule_map
+        return rules, rule_map
+
+    def start_listener(self):
+        """Invalidate whenever any process commits a rules change (LISTEN thread)."""
+        if self._listener is not None:
+            return
+        self._stop.clear()
+        self._listener = threading.Thread(target=self._listen, name="rules-listener", daemon=True)
+        self._listener.start()
+
+    def stop_listener(self):
+        self._stop.set()
+        if self._listener is not None:
+            self._listener.join(timeout=LISTEN_POLL_SECONDS + 1)
+            self._listener = None
+
+    def _listen(self):
+        while not self._stop.is_set():
+            try:
+                # A dedicated driver connection, outside the pool, held for the process lifetime
+                cargs, cparams = self.engine.dialect.create_connect_args(self.engine.url)
+                dbapi_conn = self.engine.dialect.connect(*cargs, **cparams)
+            except Exception:
+                self._stop.wait(LISTEN_POLL_SECONDS)
+                continue
+
+            try:
+                dbapi_conn.autocommit = True
+                cursor = dbapi_conn.cursor()
+                cursor.execute(f"LISTEN {self.channel}")
+                # Changes made while not listening were missed
+                self.invalidate()
+                while not self._stop.is_set():
+                    if select.select([dbapi_conn], [], [], LISTEN_POLL_SECONDS) == ([], [], []):
+                        continue
+                    dbapi_conn.poll()
+                    if dbapi_conn.notifies:
+                        dbapi_conn.notifies.clear()
+                        self.invalidate()
+            except Exception:
+                self._stop.wait(LISTEN_POLL_SECONDS)
+            finally:
+                try:
+                    dbapi_conn.close()
+                except Exception:
+                    pass
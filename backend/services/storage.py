@@ -0,0 +1,59 @@
+import json
+
+from sqlalchemy import text
+
+# Tables whose row_data column holds the full row of every uploaded record
+ROW_DATA_TABLES = ("clean_data", "quarantine_data")
+
+
+def row_data_is_jsonb(conn):
+    """True when row_data is JSONB in every data table."""
+    result = conn.execute(text("""
+        SELECT COUNT(*)
+        FROM information_schema.columns
+        WHERE table_name IN ('clean_data', 'quarantine_data')
+          AND column_name = 'row_data'
+          AND data_type = 'jsonb'
+    """))
+    return result.scalar() == len(ROW_DATA_TABLES)
+
+
+def migrate_row_data_to_jsonb(conn):
+    """
+    Convert row_data from TEXT to JSONB and add GIN indexes for containment
+    filters (row_data @> '{"col": "value"}'). Safe to run repeatedly.
+    """
+    for table_name in ROW_DATA_TABLES:
+        data_type = conn.execute(text("""
+            SELECT data_type
+            FROM information_schema.columns
+            WHERE table_name = :table_name AND column_name = 'row_data'
+        """), {"table_name": table_name}).scalar()
+
+        # Converting rewrites the table, so only do it once
+        if data_type != "jsonb":
+            conn.execute(text(f"""
+                ALTER TABLE {table_name}
+                ALTER COLUMN row_data TYPE JSONB USING row_data::jsonb
+            """))
+        conn.execute(text(f"""
+            CREATE INDEX IF NOT EXISTS idx_{table_name}_row_data_gin
+            ON {table_name} USING GIN (row_data jsonb_path_ops)
+        """))
+
+
+def row_data_sql(is_jsonb):
+    """
+    SQL expression for row_data as JSONB. Against a TEXT column the cast
+    still lets filters and projections run in PostgreSQL, just without an index.
+    """
+    return "row_data" if is_jsonb else "CAST(row_data AS JSONB)"
+
+
+def decode_row_data(value):
+    """Return row_data as a dict whether the driver handed back JSONB or TEXT."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
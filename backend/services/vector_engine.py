@@ -0,0 +1,122 @@
+import re
+from collections import namedtuple
+
+import numpy as np
+
+# Result of validating a batch column by column:
+#   row_ok: bool array, True where the row passed every rule
+#   column_failures: {column_name: sorted array of failing row indices}
+#   rule_failures: {plan index: sorted array of failing row indices}
+ColumnValidation = namedtuple("ColumnValidation", ["row_ok", "column_failures", "rule_failures"])
+
+# Placeholder for rows that do not carry a column; rules on it are skipped for that row
+MISSING = object()
+
+
+def _range_bounds(rule_value):
+    try:
+        min_val, max_val = rule_value.split("-")
+        return int(min_val), int(max_val)
+    except Exception:
+        return None
+
+
+def _check_range(rule, values):
+    bounds = _range_bounds(rule.value)
+    if bounds is None:
+        return np.zeros(len(values), dtype=bool)
+    low, high = bounds
+    try:
+        # Fast path: the whole column parses as int64, compare as arrays
+        ints = np.fromiter(map(int, values), dtype=np.int64, count=len(values))
+    except (TypeError, ValueError, OverflowError):
+        # Dirty column: fall back to the scalar validator for exact semantics
+        return np.fromiter(map(rule.check, values), dtype=bool, count=len(values))
+    return (ints >= low) & (ints <= high)
+
+
+def _check_regex(rule, values):
+    pattern = re.compile(rule.value)
+    return np.fromiter(
+        map(bool, map(pattern.match, map(str, values))),
+        dtype=bool,
+        count=len(values),
+    )
+
+
+def _check_column(rule, values):
+    if rule.type == "range":
+        return _check_range(rule, values)
+    if rule.type == "regex":
+        return _check_regex(rule, values)
+    return np.fromiter(map(rule.check, values), dtype=bool, count=len(values))
+
+
+def columns_from_rows(rows, column_names):
+    """
+    Transpose a batch of row dicts into {column_name: list of values}.
+    Rows without a column get MISSING in that slot.
+    """
+    return {name: [row.get(name, MISSING) for row in rows] for name in column_names}
+
+
+def validate_columns(plan, columns, n_rows):
+    """
+    Validate a batch one column at a time.
+
+    Args:
+        plan: Compiled rule plan from rule_engine.compile_rules
+        columns: {column_name: list of n_rows values}; columns absent
+            from the mapping are skipped, as are MISSING cells
+        n_rows: Number of rows in the batch
+
+    Returns:
+        ColumnValidation with the per-row pass bitmap and failure indices
+    """
+    row_ok = np.ones(n_rows, dtype=bool)
+    rule_failures = {}
+    column_failures = {}
+
+    for idx, rule in enumerate(plan):
+        values = columns.get(rule.column)
+        if values is None:
+            continue
+
+        if values.count(MISSING):
+            present = np.fromiter((v is not MISSING for v in values), dtype=bool, count=n_rows)
+            passed = np.ones(n_rows, dtype=bool)
+            passed[present] = _check_column(rule, [v for v in values if v is not MISSING])
+        else:
+            passed = _check_column(rule, values)
+
+        failed = np.flatnonzero(~passed)
+        if failed.size:
+            rule_failures[idx] = failed
+            row_ok[failed] = False
+            previous = column_failures.get(rule.column)
+            column_failures[rule.column] = failed if previous is None else np.union1d(previous, failed)
+
+    return ColumnValidation(row_ok, column_failures, rule_failures)
+
+
+def failures_by_row(plan, result, n_rows):
+    """
+    Expand rule_failures into one list of failed CompiledRule per row,
+    in plan order (the same shape rule_engine.validate_rows returns).
+    """
+    per_row = [[] for _ in range(n_rows)]
+    for idx in sorted(result.rule_failures):
+        rule = plan[idx]
+        for row_idx in result.rule_failures[idx].tolist():
+            per_row[row_idx].append(rule)
+    return per_row
+
+
+def validate_rows(plan, rows):
+    """
+    Column-at-a-time drop-in for rule_engine.validate_rows.
+    """
+    column_names = {rule.column for rule in plan}
+    columns = columns_from_rows(rows, column_names)
+    result = validate_columns(plan, columns, len(rows))
+    return failures_by_row(plan, result, len(rows))
@@ -0,0 +1,89 @@
+"""
+Benchmark: single-process validation vs ParallelValidator across worker counts.
+
+Validates synthetic rows (no database needed) with a regex and a range
+rule per column and reports rows/sec and speedup for each worker count,
+both one batch at a time and with batches pipelined as ingestion does.
+Batches default to the server's INGEST_BATCH_SIZE (1000 unless set).
+
+Usage:
+    python benchmark_parallel_validation.py [--rows 200000] [--columns 20] [--batch-size 1000] [--workers 1,2,4,8]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+from services.ingest import iter_batches
+from services.parallel import ParallelValidator
+from services.rule_engine import compile_rules, validate_rows
+
+
+def synthetic_rows(count, columns):
+    return [
+        {f"col{c}": (f"Value {i}" if c % 2 else str((i * 7 + c) % 150)) for c in range(columns)}
+        for i in range(count)
+    ]
+
+
+def synthetic_rule_map(columns):
+    return {
+        f"col{c}": [{"type": "regex", "value": "^[A-Za-z ]+[0-9]*$"}] if c % 2
+        else [{"type": "range", "value": "0-120"}]
+        for c in range(columns)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=int(os.environ.get("INGEST_BATCH_SIZE", "1000")))
+    parser.add_argument("--workers", default=",".join(str(n) for n in (1, 2, 4, 8, os.cpu_count()) if n <= os.cpu_count()))
+    parser.add_argument("--engine", choices=("row", "vector"), default="row")
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.rows, args.columns)
+    rule_map = synthetic_rule_map(args.columns)
+    worker_counts = sorted({int(n) for n in args.workers.split(",")})
+
+    print("=" * 60)
+    print(f"Parallel validation: {args.rows:,} rows x {args.columns} columns, batch {args.batch_size:,}")
+    print("=" * 60)
+
+    plan = compile_rules(rule_map)
+    start = time.perf_counter()
+    expected = []
+    for batch in iter_batches(rows, args.batch_size):
+        expected.extend(validate_rows(plan, batch))
+    baseline = time.perf_counter() - start
+    print(f"{'in-process':<12} {baseline:8.2f}s  {args.rows / baseline:12,.0f} rows/sec  (1.0x)")
+
+    for workers in worker_counts:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            validator = ParallelValidator(pool, rule_map, workers, args.engine)
+            validator.validate_rows(rows[:workers * 1000])  # warm up worker processes
+
+            start = time.perf_counter()
+            merged = []
+            for batch in iter_batches(rows, args.batch_size):
+                merged.extend(validator.validate_rows(batch))
+            elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            pipelined = []
+            for _, failed in validator.validate_batches(iter_batches(rows, args.batch_size)):
+                pipelined.extend(failed)
+            elapsed_pipelined = time.perf_counter() - start
+
+        assert merged == expected, "parallel results differ from in-process validation"
+        assert pipelined == expected, "pipelined results differ from in-process validation"
+        print(f"{f'{workers} workers':<12} {elapsed:8.2f}s  {args.rows / elapsed:12,.0f} rows/sec  ({baseline / elapsed:.1f}x)"
+              f"  pipelined {elapsed_pipelined:6.2f}s  ({baseline / elapsed_pipelined:.1f}x)")
+
+if __name__ == "__main__":
+    main()
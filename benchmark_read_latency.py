@@ -0,0 +1,132 @@
+"""
+Load test: p50/p99 latency of the dashboard read endpoints, sync vs async path.
+
+Starts the backend with uvicorn twice, with DB_ASYNC_READS=0 (sync engine in
+the threadpool) and DB_ASYNC_READS=1 (asyncpg), and fires concurrent GETs at
+/jobs, /jobs/{id}, /logs/{id}, /quarantine, /clean-data and /rules.
+Needs uvicorn, httpx and asyncpg, and a database holding at least one job.
+
+Usage:
+    python benchmark_read_latency.py [--concurrency 200] [--requests 5000]
+    python benchmark_read_latency.py --url http://127.0.0.1:8000   (measure a running server only)
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).parent / "backend"
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def read_paths(base_url):
+    """The endpoints a dashboard polls, pointed at the most recent job."""
+    jobs = httpx.get(f"{base_url}/jobs", timeout=30).json()
+    if not jobs:
+        sys.exit("No jobs in the database; upload a file first")
+    job_id = jobs[0]["id"]
+    return [
+        "/jobs",
+        f"/jobs/{job_id}",
+        f"/logs/{job_id}",
+        "/quarantine?limit=50",
+        f"/clean-data?job_id={job_id}&limit=50",
+        "/rules",
+    ]
+
+
+async def run_load(base_url, paths, concurrency, total):
+    """Issue `total` GETs over `concurrency` concurrent clients; return (latencies, errors, seconds)."""
+    latencies, errors = [], 0
+    issued = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal issued, errors
+            while issued < total:
+                path = paths[issued % len(paths)]
+                issued += 1
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return sorted(latencies), errors, elapsed
+
+
+def wait_until_up(base_url, process, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            sys.exit(f"Server exited with code {process.returncode}")
+        try:
+            httpx.get(f"{base_url}/", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.5)
+    process.terminate()
+    sys.exit("Server did not start in time")
+
+
+def measure(label, base_url, args):
+    paths = read_paths(base_url)
+    asyncio.run(run_load(base_url, paths, min(args.concurrency, 20), 100))  # warm up pools
+    latencies, errors, elapsed = asyncio.run(run_load(base_url, paths, args.concurrency, args.requests))
+    read_path = httpx.get(f"{base_url}/metrics", timeout=30).json().get("read_path", "?")
+    print(f"{label:<8} {read_path:<11} {len(latencies) / elapsed:10,.0f} req/s  "
+          f"p50 {1000 * percentile(latencies, 0.50):8.1f} ms  "
+          f"p99 {1000 * percentile(latencies, 0.99):8.1f} ms  errors {errors}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--url", help="Measure an already running server instead of starting both modes")
+    args = parser.parse_args()
+
+    print("=" * 78)
+    print(f"Read latency: {args.requests:,} requests, {args.concurrency} concurrent clients")
+    print("=" * 78)
+
+    if args.url:
+        measure("server", args.url.rstrip("/"), args)
+        return
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    for label, async_reads in (("sync", "0"), ("async", "1")):
+        env = dict(os.environ, DB_ASYNC_READS=async_reads)
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_up(base_url, process)
+            measure(label, base_url, args)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
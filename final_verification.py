@@ -1,4 +1,5 @@
 import requests
+import time
 
 BASE_URL = "http://127.0.0.1:8000"
 
@@ -22,6 +23,11 @@ with open(csv_file, 'rb') as f:
     files = {'file': f}
     response = requests.post(f'{BASE_URL}/upload', files=files)
     upload_result = response.json()
+# Uploads are processed in the background; wait for the job to finish
+while upload_result['status'] in ('queued', 'processing'):
+    time.sleep(1)
+    upload_result = requests.get(f"{BASE_URL}/jobs/{upload_result['job_id']}").json()
+    upload_result['job_id'] = upload_result['id']
 print(f"   Job ID: {upload_result['job_id']}")
 print(f"   Total rows: {upload_result['total_rows']}")
 print(f"   Clean: {upload_result['clean_rows']}")
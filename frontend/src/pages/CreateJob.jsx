@@ -83,11 +83,23 @@ export default function CreateJob() {
       setProgress('Creating audit logs...');
       await new Promise(r => setTimeout(r, 800));
       
-      setProgress('Job completed! Preparing results...');
-      
       const response = await apiService.uploadCSV(file, columnRules);
+      const queued = response.data || response;
+      
+      // The server validates in the background; poll the job until it finishes
+      let job = { status: queued.status };
+      while (job.status === 'queued' || job.status === 'processing') {
+        await new Promise(r => setTimeout(r, 1000));
+        const status = await apiService.getJobStatus(queued.job_id);
+        job = status.data || status;
+        setProgress(`Validating rows... ${job.total_rows || 0} processed`);
+      }
+      if (job.status === 'failed') {
+        throw new Error(job.error_message || 'Job failed');
+      }
       
-      setResult(response.data || response);
+      setProgress('Job completed! Preparing results...');
+      setResult({ ...job, job_id: job.id });
       setFile(null);
       setProgress('');
       document.getElementById('file-input') && (document.getElementById('file-input').value = '');
@@ -1,32 +1,61 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { apiService } from '../services/api';
 
+// Rows fetched per request; further pages are loaded on demand
+const PAGE_SIZE = 100;
+
+const pageRows = (response) => (Array.isArray(response.data) ? response.data : []);
+
 export default function QuarantinePage() {
   const [rows, setRows] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [editingId, setEditingId] = useState(null);
   const [editValues, setEditValues] = useState({});
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [message, setMessage] = useState('');
+  // Once later pages are loaded, polling stops replacing them with the first page
+  const pagesLoaded = useRef(0);
 
   useEffect(() => {
     fetchQuarantine();
-    const interval = setInterval(fetchQuarantine, 5000);
+    const interval = setInterval(() => {
+      if (pagesLoaded.current <= 1) fetchQuarantine();
+    }, 5000);
     return () => clearInterval(interval);
   }, []);
 
   const fetchQuarantine = async () => {
     try {
-      const response = await apiService.getQuarantine();
-      setRows(Array.isArray(response) ? response : []);
+      const response = await apiService.getQuarantine(null, PAGE_SIZE);
+      setRows(pageRows(response));
+      setNextCursor(response.headers['x-next-cursor'] || null);
+      pagesLoaded.current = 1;
       setMessage('');
     } catch (error) {
       setMessage(`Error fetching quarantine: ${error.message}`);
       setRows([]);
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const response = await apiService.getQuarantine(nextCursor, PAGE_SIZE);
+      setRows((loaded) => [...loaded, ...pageRows(response)]);
+      setNextCursor(response.headers['x-next-cursor'] || null);
+      pagesLoaded.current += 1;
+    } catch (error) {
+      setMessage(`Error fetching quarantine: ${error.message}`);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleEdit = (row) => {
     setEditingId(row.id);
     setEditValues({ name: row.name, age: row.age });
@@ -85,7 +114,7 @@ export default function QuarantinePage() {
       ) : (
         <>
           <p style={{ color: '#666', marginBottom: '15px' }}>
-            Found <strong>{rows.length}</strong> quarantined rows. Edit and revalidate them.
+            Showing <strong>{rows.length}</strong>{nextCursor ? '+' : ''} quarantined rows. Edit and revalidate them.
           </p>
           <table style={{
             width: '100%',
@@ -204,6 +233,24 @@ export default function QuarantinePage() {
               ))}
             </tbody>
           </table>
+          {nextCursor && (
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              style={{
+                marginTop: '15px',
+                padding: '10px 20px',
+                backgroundColor: '#6c757d',
+                color: 'white',
+                border: 'none',
+                borderRadius: '4px',
+                cursor: loadingMore ? 'wait' : 'pointer',
+                fontSize: '14px'
+              }}
+            >
+              {loadingMore ? 'Loading...' : `Load ${PAGE_SIZE} more`}
+            </button>
+          )}
         </>
       )}
 
@@ -43,7 +43,15 @@ export const apiService = {
   deleteRule: (ruleId) => axios.delete(`${API_BASE}/rules/${ruleId}`),
   
   // Quarantine
-  getQuarantine: () => axios.get(`${API_BASE}/quarantine`),
+  // One page of quarantined rows; the X-Next-Cursor response header is the cursor of the next page
+  getQuarantine: (cursor = null, limit = 100, jobId = null) =>
+    axios.get(`${API_BASE}/quarantine`, {
+      params: {
+        limit,
+        ...(cursor && { cursor }),
+        ...(jobId && { job_id: jobId })
+      }
+    }),
   updateQuarantine: (rowId, name, age) =>
     axios.put(`${API_BASE}/update-quarantine/${rowId}`, null, {
       params: { name, age }
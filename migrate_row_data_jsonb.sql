@@ -0,0 +1,16 @@
+-- Migration: Store row_data as JSONB instead of JSON text
+-- Lets filters and projections on dynamic columns run in PostgreSQL
+-- (the backend applies this automatically when ROW_DATA_STORAGE=jsonb)
+
+-- Convert row_data from TEXT to JSONB
+ALTER TABLE clean_data ALTER COLUMN row_data TYPE JSONB USING row_data::jsonb;
+ALTER TABLE quarantine_data ALTER COLUMN row_data TYPE JSONB USING row_data::jsonb;
+
+-- GIN indexes for containment filters: row_data @> '{"column": "value"}'
+CREATE INDEX IF NOT EXISTS idx_clean_data_row_data_gin ON clean_data USING GIN (row_data jsonb_path_ops);
+CREATE INDEX IF NOT EXISTS idx_quarantine_data_row_data_gin ON quarantine_data USING GIN (row_data jsonb_path_ops);
+
+-- Verify the changes
+SELECT table_name, column_name, data_type
+FROM information_schema.columns
+WHERE table_name IN ('clean_data', 'quarantine_data') AND column_name = 'row_data';
@@ -0,0 +1,93 @@
+"""
+Check that a memory-mapped CSV split into byte ranges parses to the same
+rows as the whole file read through the streaming reader.
+
+Covers quoted fields with commas, doubled quotes and line breaks, CRLF
+line endings, multi-byte UTF-8, and files that must not be split.
+
+Usage:
+    python test_csv_ranges.py      (or: python -m pytest test_csv_ranges.py)
+"""
+import csv
+import io
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+from services.ingest import csv_data_start, map_file, open_buffer_rows, open_csv_rows, split_line_ranges
+
+VALUES = ["John", "Zoë", "Smith, John", 'He said "hi"', "two\nlines", "crlf\r\nline", "", "25", "€100"]
+
+
+def make_csv(rows, line_terminator="\n", seed=0):
+    rng = random.Random(seed)
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator=line_terminator)
+    writer.writerow(["name", "note", "age"])
+    for i in range(rows):
+        writer.writerow([rng.choice(VALUES), rng.choice(VALUES), str(i)])
+    return out.getvalue().encode("utf-8")
+
+
+def streamed_rows(data):
+    return list(open_csv_rows(io.BytesIO(data), chunk_size=4096))
+
+
+def ranged_rows(buffer, parts):
+    columns = next(csv.reader([buffer[:csv_data_start(buffer)].decode("utf-8")]))
+    ranges = split_line_ranges(buffer, parts, csv_data_start(buffer))
+    assert ranges[0][0] == csv_data_start(buffer) and ranges[-1][1] == len(buffer)
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:])), "ranges must be contiguous"
+    rows = []
+    for start, end in ranges:
+        rows.extend(open_buffer_rows(buffer, start, end, columns))
+    return rows, len(ranges)
+
+
+def test_ranges_match_streaming_reader():
+    for line_terminator in ("\n", "\r\n"):
+        data = make_csv(5000, line_terminator)
+        expected = streamed_rows(data)
+        for parts in (1, 2, 7, 64):
+            rows, count = ranged_rows(data, parts)
+            assert rows == expected, f"{parts} parts, {line_terminator!r}: rows differ"
+            assert count > 1 or parts == 1, f"{parts} parts gave a single range"
+
+
+def test_memory_map_matches_streaming_reader():
+    data = make_csv(2000)
+    with tempfile.TemporaryFile() as spooled:
+        spooled.write(data)
+        spooled.flush()
+        with map_file(spooled) as buffer:
+            assert list(open_buffer_rows(buffer)) == streamed_rows(data)
+            assert ranged_rows(buffer, 5)[0] == streamed_rows(data)
+
+
+def test_unsafe_files_are_not_split():
+    # A literal quote inside an unquoted field, then an odd quote count
+    for data in (b"name,age\n" + b'5" screen,1\n' * 100 + b'5" screen,1\n',
+                 b"name,age\n" + b'a"b,1\n' * 100):
+        assert split_line_ranges(data, 4, csv_data_start(data)) == [(csv_data_start(data), len(data))]
+
+
+def test_empty_file_maps_to_empty_buffer():
+    with tempfile.TemporaryFile() as spooled:
+        with map_file(spooled) as buffer:
+            assert buffer == b""
+            assert open_buffer_rows(buffer).fieldnames is None
+
+
+if __name__ == "__main__":
+    failures = 0
+    for test in (test_ranges_match_streaming_reader, test_memory_map_matches_streaming_reader,
+                 test_unsafe_files_are_not_split, test_empty_file_maps_to_empty_buffer):
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"✗ {test.__name__}: {e}")
+    sys.exit(1 if failures else 0)
@@ -9,3 +9,15 @@ rule_value = "^[A-Za-z]+$"
 for name in names_to_test:
     result = apply_rule(name, "regex", rule_value)
     print(f"'{name}' against '{rule_value}': {result}")
+
+# Test a compiled rule plan against whole rows
+from backend.services.rule_engine import build_rule_map, compile_rules, validate_row
+
+plan = compile_rules(build_rule_map(
+    [("name", "regex", rule_value), ("age", "range", "0-120")],
+    {"age": {"type": "range", "value": "18-65"}}
+))
+
+for row in [{"name": "John", "age": "25"}, {"name": "Bob123", "age": "70"}, {"name": "Eve"}]:
+    failed = validate_row(plan, row)
+    print(f"{row}: {[f'{r.column}:{r.type}:{r.value}' for r in failed] or 'valid'}")
@@ -0,0 +1,81 @@
+"""
+Upload a large file with the chunked, resumable upload API.
+
+Sends the file in numbered chunks with their SHA-256, retrying failed
+chunks. If interrupted, run again with --resume <upload_id>: only the
+chunks the server has not received are sent (use the same --chunk-size-mb).
+
+Usage:
+    python upload_chunked.py extract.csv [--chunk-size-mb 32] [--url http://127.0.0.1:8000]
+    python upload_chunked.py extract.csv --resume <upload_id>
+    python upload_chunked.py suppliers.xlsx --sheets all      (or --sheets '["Jan", "Feb"]')
+"""
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+import httpx
+
+RETRIES = 5
+
+
+def put_chunk(session, base_url, upload_id, index, data):
+    headers = {"X-Chunk-SHA256": hashlib.sha256(data).hexdigest()}
+    for attempt in range(1, RETRIES + 1):
+        try:
+            response = session.put(f"{base_url}/uploads/{upload_id}/chunks/{index}", content=data, headers=headers, timeout=300)
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code in (400, 409, 413):
+                sys.exit(f"Chunk {index} rejected: {response.text}")
+        except httpx.HTTPError as e:
+            print(f"  chunk {index} attempt {attempt} failed: {e}")
+        time.sleep(min(2 ** attempt, 30))
+    sys.exit(f"Chunk {index} failed after {RETRIES} attempts; rerun with --resume {upload_id}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--chunk-size-mb", type=int, default=32)
+    parser.add_argument("--resume", help="upload_id of an interrupted upload")
+    parser.add_argument("--sheets", help='Excel: "all" or a JSON list of sheet names, ingested as sub-jobs')
+    args = parser.parse_args()
+
+    base_url = args.url.rstrip("/")
+    session = httpx.Client()
+
+    if args.resume:
+        upload_id = args.resume
+        state = session.get(f"{base_url}/uploads/{upload_id}", timeout=30).json()
+        job_id = state["job_id"]
+        received = {c["index"] for c in state["chunks"]}
+        chunk_size = args.chunk_size_mb * 1024 * 1024
+    else:
+        created = session.post(f"{base_url}/uploads", json={"filename": os.path.basename(args.path), "sheets": args.sheets}, timeout=30).json()
+        upload_id, job_id = created["upload_id"], created["job_id"]
+        received = set()
+        chunk_size = min(args.chunk_size_mb * 1024 * 1024, created["max_chunk_size"])
+
+    total_chunks = max(1, -(-os.path.getsize(args.path) // chunk_size))
+    print(f"Upload {upload_id} (job {job_id}): {total_chunks} chunks of {chunk_size:,} bytes")
+
+    start = time.perf_counter()
+    with open(args.path, "rb") as source:
+        for index in range(total_chunks):
+            if index in received:
+                continue
+            source.seek(index * chunk_size)
+            put_chunk(session, base_url, upload_id, index, source.read(chunk_size))
+            print(f"  chunk {index + 1}/{total_chunks} sent")
+
+    response = session.post(f"{base_url}/uploads/{upload_id}/complete", json={"total_chunks": total_chunks}, timeout=300)
+    print(f"Complete: {response.status_code} {response.json()} in {time.perf_counter() - start:.1f}s")
+    print(f"Poll {base_url}/jobs/{job_id} for validation progress")
+
+
+if __name__ == "__main__":
+    main()
@@ -54,6 +54,12 @@ with open(csv_file, 'rb') as f:
     upload_response = requests.post(f'{BASE_URL}/upload', files=files)
     upload_data = upload_response.json()
 
+# Uploads are processed in the background; wait for the job to finish
+while upload_data['status'] in ('queued', 'processing'):
+    time.sleep(1)
+    upload_data = requests.get(f"{BASE_URL}/jobs/{upload_data['job_id']}").json()
+    upload_data['job_id'] = upload_data['id']
+
 job_id = upload_data['job_id']
 print(f"   Job ID: {job_id}")
 print(f"   Total rows: {upload_data['total_rows']}")